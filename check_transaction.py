@@ -8,45 +8,89 @@ Usage:
 
 import os
 import sys
+import time
 import base64
-import argparse
-from datetime import datetime, timedelta
+import hashlib
+import re
+import functools
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 import jwt
-import requests
+import httpx
+import orjson
 from typing import Optional, Dict, Any
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking
+    fcntl = None
+
 # API base URL
 API_BASE_URL = "https://prism-api.caudena.com"
 
+# Shared HTTP/2 client: concurrent API calls are multiplexed on one TLS connection
+_CLIENT = httpx.Client(
+    http2=True,
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    headers={"Accept": "application/json"},
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+)
+
+# Retry policy for transient failures
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.2  # seconds, doubled after each attempt
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+MAX_RETRY_AFTER = 10.0  # seconds, upper bound for a server-requested Retry-After
+
+# Local cache for JWT tokens (reused while still valid)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "caudena")
+TOKEN_MIN_VALIDITY = 30  # seconds of validity required to reuse a cached token
+TX_CACHE_MIN_CONFIRMATIONS = 6  # transactions are cached once considered final
+
+# Accepted key names for API credentials, in order of priority
+CANDIDATE_KID_KEYS = ("CAUDENA_KID", "id_caudena", "KID", "API_KID", "CAUDENA_API_KID")
+CANDIDATE_SECRET_KEYS = ("CAUDENA_SECRET", "secret", "SECRET", "API_SECRET", "CAUDENA_API_SECRET")
+ENV_CREDENTIAL_KEYS = ("CAUDENA_KID", "CAUDENA_SECRET")  # names read from the process environment
+
+# Single-pass .env line parser: KEY=value, KEY:value, KEY = value, export KEY=value, quoted values
+_ENV_RE = re.compile(r'^\s*(?:export\s+)?([A-Za-z_][\w\-.]*)\s*[:=]\s*(?:"([^"]*)"|\'([^\']*)\'|(.*?))\s*$')
+
+# Supported currencies/blockchains
+CURRENCIES = ("btc", "eth", "ltc", "doge", "trx", "bnb")
+SUPPORTED_CURRENCIES = frozenset(CURRENCIES)
+
+# Maximum number of transactions fetched in a single address-mode request
+MAX_LIMIT = 100
+
+class APIError(Exception):
+    """Raised when an API request fails"""
+
 def load_env_file(filepath: str) -> Dict[str, str]:
     """Load variables from a .env file"""
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+    except OSError:
+        return {}
+    return dict(_parse_env_file(filepath, mtime))
+
+@functools.lru_cache(maxsize=4)
+def _parse_env_file(filepath: str, mtime: int) -> Dict[str, str]:
+    """Parse a .env file (cached per path and modification time)"""
     env_vars = {}
-    if os.path.exists(filepath):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    # Ignore comments and empty lines
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    # Support different formats: KEY=value, KEY:value, KEY = value, export KEY=value
-                    separator = '=' if '=' in line else ':' if ':' in line else None
-                    if separator:
-                        # Remove 'export' if present
-                        line = line.replace('export ', '').strip()
-                        parts = line.split(separator, 1)
-                        if len(parts) == 2:
-                            key = parts[0].strip()
-                            value = parts[1].strip()
-                            # Remove quotes if present
-                            if value.startswith('"') and value.endswith('"'):
-                                value = value[1:-1]
-                            elif value.startswith("'") and value.endswith("'"):
-                                value = value[1:-1]
-                            env_vars[key] = value
-        except Exception as e:
-            print(f"⚠️  Warning: Error reading {filepath} (line {line_num}): {e}")
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                # Ignore comments and empty lines
+                if not line or line.startswith('#'):
+                    continue
+                
+                m = _ENV_RE.match(line)
+                if m:
+                    key, double_quoted, single_quoted, bare = m.groups()
+                    env_vars[key] = next(v for v in (double_quoted, single_quoted, bare) if v is not None)
+    except Exception as e:
+        print(f"⚠️  Warning: Error reading {filepath} (line {line_num}): {e}")
     return env_vars
 
 def get_api_credentials() -> tuple[str, str]:
@@ -56,25 +100,17 @@ def get_api_credentials() -> tuple[str, str]:
     env_vars = {}
     
     for env_file in env_files:
-        if os.path.exists(env_file):
-            env_vars = load_env_file(env_file)
-            if env_vars:
-                break
+        env_vars = load_env_file(env_file)
+        if env_vars:
+            break
+    
+    # Only the CAUDENA_* environment variables take precedence over the .env file
+    env_credentials = {k: os.environ[k] for k in ENV_CREDENTIAL_KEYS if k in os.environ}
+    credentials = ChainMap(env_credentials, env_vars)
     
     # Try different key name variants
-    kid = (os.getenv("CAUDENA_KID") or 
-           env_vars.get("CAUDENA_KID") or 
-           env_vars.get("id_caudena") or
-           env_vars.get("KID") or
-           env_vars.get("API_KID") or
-           env_vars.get("CAUDENA_API_KID"))
-    
-    secret = (os.getenv("CAUDENA_SECRET") or 
-              env_vars.get("CAUDENA_SECRET") or 
-              env_vars.get("secret") or
-              env_vars.get("SECRET") or
-              env_vars.get("API_SECRET") or
-              env_vars.get("CAUDENA_API_SECRET"))
+    kid = next((credentials[k] for k in CANDIDATE_KID_KEYS if credentials.get(k)), None)
+    secret = next((credentials[k] for k in CANDIDATE_SECRET_KEYS if credentials.get(k)), None)
     
     if not kid:
         print("❌ Error: CAUDENA_KID not found")
@@ -94,8 +130,8 @@ def get_api_credentials() -> tuple[str, str]:
     
     return kid, secret
 
-def generate_jwt_token(kid: str, secret_b64: str) -> str:
-    """Generate a JWT token for authentication"""
+def generate_jwt_token(kid: str, secret_b64: str) -> tuple[str, int]:
+    """Generate a JWT token for authentication, returning the token and its expiration"""
     try:
         # Decode secret from base64
         secret = base64.b64decode(secret_b64)
@@ -104,105 +140,234 @@ def generate_jwt_token(kid: str, secret_b64: str) -> str:
         sys.exit(1)
     
     # Create payload with 5 minute expiration
+    exp = int(time.time()) + 300
     payload = {
         "kid": kid,
-        "exp": int((datetime.now() + timedelta(minutes=5)).timestamp())
+        "exp": exp
     }
     
     # Generate token
     token = jwt.encode(payload, secret, algorithm="HS256")
-    return token
+    return token, exp
 
-def make_api_request(method: str, endpoint: str, token: str, data: Optional[Dict] = None) -> Dict[str, Any]:
-    """Execute an API request"""
+def _token_cache_path(kid: str, secret_b64: str) -> str:
+    """Return the cache file path for a given set of credentials"""
+    cred_hash = hashlib.sha1(f"{kid}\0{secret_b64}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"token-{cred_hash}.json")
+
+def _lock_file(f, exclusive: bool):
+    """Acquire an advisory lock on an open file (no-op where unsupported)"""
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+def _read_cached_token(path: str) -> Optional[str]:
+    """Return the token stored at path if it is still valid"""
+    try:
+        with open(path, 'rb') as f:
+            cached = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    
+    if not isinstance(cached, dict):
+        return None
+    token = cached.get("token")
+    exp = cached.get("exp")
+    if isinstance(token, str) and isinstance(exp, (int, float)) and exp - time.time() > TOKEN_MIN_VALIDITY:
+        return token
+    return None
+
+def _atomic_write(path: str, content: bytes):
+    """Write content to path atomically with owner-only permissions"""
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def get_jwt_token(kid: str, secret_b64: str) -> tuple[str, bool]:
+    """Return a valid JWT token, reusing the cached one when possible
+    
+    The second element is True if the token came from the cache.
+    """
+    path = _token_cache_path(kid, secret_b64)
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        with open(path + ".lock", 'a') as lock:
+            _lock_file(lock, exclusive=False)
+            token = _read_cached_token(path)
+            if token:
+                return token, True
+            
+            # Another process may refresh the token while we wait for the exclusive lock
+            _lock_file(lock, exclusive=True)
+            token = _read_cached_token(path)
+            if token:
+                return token, True
+            
+            token, exp = generate_jwt_token(kid, secret_b64)
+            _atomic_write(path, orjson.dumps({"token": token, "exp": exp}))
+            return token, False
+    except OSError as e:
+        print(f"⚠️  Warning: Unable to use token cache: {e}")
+        token, _ = generate_jwt_token(kid, secret_b64)
+        return token, False
+
+def _drop_cached_token_on_401(path: str, response: httpx.Response):
+    """Remove the cached JWT token when the API rejects it"""
+    if response.status_code == 401:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _tx_cache_path(currency: str, tx_hash: str) -> Optional[str]:
+    """Return the cache file path for a transaction, or None if the hash is not cacheable"""
+    # Hex hashes are case-insensitive and EVM ones share a 0x prefix: normalize before sharding
+    key = tx_hash.lower()
+    if key.startswith("0x"):
+        key = key[2:]
+    if not (key.isascii() and key.isalnum()):
+        return None
+    return os.path.join(CACHE_DIR, "tx", currency, key[:2], f"{key}.json")
+
+def _tx_cache_get(currency: str, tx_hash: str) -> Optional[Dict[str, Any]]:
+    """Return a cached API response for a finalized transaction"""
+    path = _tx_cache_path(currency, tx_hash)
+    if not path:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            cached = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return cached if isinstance(cached, dict) else None
+
+def _tx_cache_put(currency: str, tx_hash: str, result: Dict[str, Any]):
+    """Cache an API response if the transaction has enough confirmations"""
+    path = _tx_cache_path(currency, tx_hash)
+    data = result.get("data") or {}
+    if not path or not result.get("status") or (data.get("confirmations") or 0) < TX_CACHE_MIN_CONFIRMATIONS:
+        return
+    try:
+        _atomic_write(path, orjson.dumps(result))
+    except OSError as e:
+        print(f"⚠️  Warning: Unable to cache transaction: {e}")
+
+def _retry_after(response: httpx.Response) -> float:
+    """Return the delay requested by a Retry-After header, capped at MAX_RETRY_AFTER"""
+    try:
+        return min(max(float(response.headers.get("Retry-After", 0)), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        # HTTP-date values are not supported: fall back to the backoff delay
+        return 0.0
+
+def make_api_request(method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
+    """Execute an API request, raising APIError on failure"""
     url = f"{API_BASE_URL}{endpoint}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/json"
-    }
     
-    if data:
-        headers["Content-Type"] = "application/json"
+    method = method.upper()
+    if method not in ("GET", "POST"):
+        raise ValueError(f"Unsupported method: {method}")
     
     try:
-        if method.upper() == "GET":
-            response = requests.get(url, headers=headers, timeout=30)
-        elif method.upper() == "POST":
-            response = requests.post(url, headers=headers, json=data, timeout=30)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
+        for attempt in range(MAX_RETRIES + 1):
+            delay = RETRY_BACKOFF * 2 ** attempt
+            try:
+                response = _CLIENT.request(method, url, json=data if method == "POST" else None)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # The request never reached the server, so it is safe to resend
+                if attempt == MAX_RETRIES:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                    break
+                delay = max(delay, _retry_after(response))
+            time.sleep(delay)
         
         # Show error details if present
         if response.status_code != 200:
             try:
-                error_data = response.json()
-                print(f"❌ HTTP Error {response.status_code}: {error_data}")
-            except:
-                print(f"❌ HTTP Error {response.status_code}: {response.text}")
-            sys.exit(1)
+                error_data = orjson.loads(response.content)
+            except ValueError:
+                error_data = response.text
+            raise APIError(f"HTTP Error {response.status_code}: {error_data}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
-    except requests.exceptions.HTTPError as e:
-        print(f"❌ HTTP Error: {e}")
-        if hasattr(e.response, 'text'):
-            print(f"   Details: {e.response.text}")
-        sys.exit(1)
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Request error: {e}")
-        sys.exit(1)
+    except orjson.JSONDecodeError as e:
+        raise APIError(f"Invalid JSON response: {e}") from e
+    except httpx.HTTPError as e:
+        raise APIError(f"Request error: {e}") from e
 
-def check_transaction_by_hash(currency: str, tx_hash: str, token: str):
+def check_transaction_by_hash(currency: str, tx_hash: str, use_cache: bool = True):
     """Verify a transaction by hash"""
     print(f"\n🔍 Verifying transaction: {tx_hash}")
     print(f"   Currency: {currency.upper()}\n")
     
     endpoint = f"/v2/{currency}/transaction/{tx_hash}"
     try:
-        result = make_api_request("GET", endpoint, token)
+        result = _tx_cache_get(currency, tx_hash) if use_cache else None
+        cached = result is not None
+        if cached:
+            print("💾 Using cached transaction data (run with --no-cache to refresh)\n")
+        else:
+            result = make_api_request("GET", endpoint)
+            if use_cache:
+                _tx_cache_put(currency, tx_hash, result)
         
         if result.get("status"):
             data = result.get("data", {})
             if data:
-                print_transaction_details(data)
+                print_transaction_details(data, cached=cached)
             else:
                 print("❌ No data in response")
                 print(f"   Full response: {result}")
         else:
             print("❌ Transaction not found or error in response")
             print(f"   Response: {result}")
-    except SystemExit:
-        pass
+    except APIError as e:
+        print(f"❌ {e}")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
 
-def check_transaction_by_address(currency: str, address: str, token: str):
+def check_transaction_by_address(currency: str, address: str, limit: int = 5):
     """Verify transactions by address"""
     print(f"\n🔍 Verifying address: {address}")
     print(f"   Currency: {currency.upper()}\n")
     
-    # First retrieve address statistics
     endpoint_stats = f"/v2/{currency}/address/stats/{address}"
-    stats_result = make_api_request("GET", endpoint_stats, token)
-    
-    if stats_result.get("status"):
-        print_address_stats(stats_result.get("data", {}))
-    
-    # Then retrieve transactions (first 5)
-    print("\n" + "="*80)
-    print("📋 Recent transactions (first 5):")
-    print("="*80 + "\n")
-    
     endpoint_tx = f"/v2/{currency}/address/transactions/{address}"
     tx_data = {
         "page": 1,
+        "page_size": limit,
         "sort_by": "time",
         "sort_order": "desc"
     }
-    tx_result = make_api_request("POST", endpoint_tx, token, tx_data)
+    
+    # Statistics and transactions are independent: fetch them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stats_future = executor.submit(make_api_request, "GET", endpoint_stats)
+        tx_future = executor.submit(make_api_request, "POST", endpoint_tx, tx_data)
+        try:
+            stats_result = stats_future.result()
+            tx_result = tx_future.result()
+        except APIError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    
+    # First print address statistics
+    if stats_result.get("status"):
+        print_address_stats(stats_result.get("data", {}))
+    
+    # Then print transactions (first N)
+    print("\n" + "="*80)
+    print(f"📋 Recent transactions (first {limit}):")
+    print("="*80 + "\n")
     
     if tx_result.get("status"):
-        transactions = tx_result.get("data", [])[:5]
+        # Slice locally in case the API ignores page_size
+        transactions = tx_result.get("data", [])[:limit]
         pagination = tx_result.get("pagination", {})
         
         print(f"Total transactions: {pagination.get('total_entries', 0)}\n")
@@ -214,59 +379,67 @@ def check_transaction_by_address(currency: str, address: str, token: str):
     else:
         print("❌ No transactions found")
 
-def print_transaction_details(data: Dict):
+def _emit(lines: list[str]):
+    """Write a block of output lines to stdout with a single write"""
+    sys.stdout.write('\n'.join(lines))
+    sys.stdout.write('\n')
+
+def _is_malicious(side: Dict) -> bool:
+    """Return True if a transaction input/output is a low-score contract"""
+    score = side.get('score')
+    return bool(side.get('contract') and score and score < 4)
+
+def print_transaction_details(data: Dict, cached: bool = False):
     """Print complete transaction details"""
-    print("="*80)
-    print("📄 TRANSACTION DETAILS")
-    print("="*80)
-    
-    print(f"\n🔹 Hash: {data.get('hash', 'N/A')}")
-    print(f"🔹 Status: {'✅ Confirmed' if data.get('status') else '⏳ Pending'}")
-    print(f"🔹 Currency: {data.get('currency', 'N/A').upper()}")
-    print(f"🔹 Timestamp: {format_timestamp(data.get('time', 0))}")
-    print(f"🔹 Block Height: {data.get('height', 'N/A')}")
-    print(f"🔹 Confirmations: {data.get('confirmations', 0):,}")
-    
-    print(f"\n💰 Amounts:")
-    print(f"   Amount: {data.get('amount', 'N/A')}")
-    print(f"   Amount USD: ${data.get('amount_usd', 0):,.2f}")
-    print(f"   Fee: {data.get('fee', 'N/A')}")
-    print(f"   Fee USD: ${data.get('fee_usd', 0):,.2f}")
+    lines = ["="*80, "📄 TRANSACTION DETAILS", "="*80]
+    
+    lines.append(f"\n🔹 Hash: {data.get('hash', 'N/A')}")
+    lines.append(f"🔹 Status: {'✅ Confirmed' if data.get('status') else '⏳ Pending'}")
+    lines.append(f"🔹 Currency: {data.get('currency', 'N/A').upper()}")
+    lines.append(f"🔹 Timestamp: {format_timestamp(data.get('time', 0))}")
+    lines.append(f"🔹 Block Height: {data.get('height', 'N/A')}")
+    if cached:
+        # The stored count is only a lower bound: the transaction kept confirming since
+        lines.append(f"🔹 Confirmations: at least {data.get('confirmations', 0):,} (cached)")
+    else:
+        lines.append(f"🔹 Confirmations: {data.get('confirmations', 0):,}")
+    
+    lines.append(f"\n💰 Amounts:")
+    lines.append(f"   Amount: {data.get('amount', 'N/A')}")
+    lines.append(f"   Amount USD: ${data.get('amount_usd', 0):,.2f}")
+    lines.append(f"   Fee: {data.get('fee', 'N/A')}")
+    lines.append(f"   Fee USD: ${data.get('fee_usd', 0):,.2f}")
     
     if data.get('gas'):
-        print(f"   Gas: {data.get('gas', 'N/A')}")
-        print(f"   Gas Used: {data.get('gas_used', 'N/A')}")
-        print(f"   Gas Price: {data.get('gas_price', 'N/A')}")
-    
-    # Inputs
-    if 'inputs' in data and data['inputs']:
-        print(f"\n📥 Inputs ({len(data['inputs'])}):")
-        for i, inp in enumerate(data['inputs'][:3], 1):
-            addr = inp.get('address', 'N/A')
-            amount = inp.get('amount', 0)
-            amount_usd = inp.get('amount_usd', 0)
-            score = inp.get('score', 'N/A')
-            entity = inp.get('name', 'Unidentified')
-            print(f"   {i}. {addr[:20]}... | {amount:,} | ${amount_usd:,.2f} | Score: {score} | {entity}")
-        if len(data['inputs']) > 3:
-            print(f"   ... and {len(data['inputs']) - 3} more inputs")
-    
-    # Outputs
-    if 'outputs' in data and data['outputs']:
-        print(f"\n📤 Outputs ({len(data['outputs'])}):")
-        for i, out in enumerate(data['outputs'][:3], 1):
-            addr = out.get('address', 'N/A')
-            amount = out.get('amount', 0)
-            amount_usd = out.get('amount_usd', 0)
-            score = out.get('score', 'N/A')
-            entity = out.get('name', 'Unidentified')
-            print(f"   {i}. {addr[:20]}... | {amount:,} | ${amount_usd:,.2f} | Score: {score} | {entity}")
-        if len(data['outputs']) > 3:
-            print(f"   ... and {len(data['outputs']) - 3} more outputs")
+        lines.append(f"   Gas: {data.get('gas', 'N/A')}")
+        lines.append(f"   Gas Used: {data.get('gas_used', 'N/A')}")
+        lines.append(f"   Gas Price: {data.get('gas_price', 'N/A')}")
+    
+    inputs = data.get('inputs') or ()
+    outputs = data.get('outputs') or ()
+    malicious = []
+    
+    # Inputs and outputs: print the first 3 and collect suspicious contracts in a single pass
+    for side, items, header in (("Input", inputs, "📥 Inputs"), ("Output", outputs, "📤 Outputs")):
+        if not items:
+            continue
+        lines.append(f"\n{header} ({len(items)}):")
+        for i, item in enumerate(items, 1):
+            score = item.get('score')
+            if i <= 3:
+                addr = item.get('address', 'N/A')
+                amount = item.get('amount', 0)
+                amount_usd = item.get('amount_usd', 0)
+                entity = item.get('name', 'Unidentified')
+                lines.append(f"   {i}. {addr[:20]}... | {amount:,} | ${amount_usd:,.2f} | Score: {score if score is not None else 'N/A'} | {entity}")
+            if _is_malicious(item):
+                malicious.append((side, item))
+        if len(items) > 3:
+            lines.append(f"   ... and {len(items) - 3} more {side.lower()}s")
     
     # Token transfers (for EVM)
     if 'tokens' in data and data['tokens']:
-        print(f"\n🪙 Token Transfers ({len(data['tokens'])}):")
+        lines.append(f"\n🪙 Token Transfers ({len(data['tokens'])}):")
         for token in data['tokens'][:5]:
             token_info = token.get('token', {})
             value = token.get('value', 0)
@@ -280,7 +453,7 @@ def print_transaction_details(data: Dict):
             if scam or spam:
                 warning = " ⚠️  SCAM/SPAM!"
             
-            print(f"   {symbol} ({name}): {value:,} (${usd:,.2f}){warning}")
+            lines.append(f"   {symbol} ({name}): {value:,} (${usd:,.2f}){warning}")
             
             sender = token.get('sender', {})
             receiver = token.get('receiver', {})
@@ -288,105 +461,86 @@ def print_transaction_details(data: Dict):
                 sender_addr = sender.get('address', 'N/A')
                 sender_score = sender.get('score', 'N/A')
                 sender_entity = sender.get('entity', {}).get('name', 'Unidentified') if sender.get('entity') else 'Unidentified'
-                print(f"      From: {sender_addr[:20]}... (Score: {sender_score}, {sender_entity})")
+                lines.append(f"      From: {sender_addr[:20]}... (Score: {sender_score}, {sender_entity})")
             if receiver.get('address'):
                 receiver_addr = receiver.get('address', 'N/A')
                 receiver_score = receiver.get('score', 'N/A')
                 receiver_entity = receiver.get('entity', {}).get('name', 'Unidentified') if receiver.get('entity') else 'Unidentified'
-                print(f"      To: {receiver_addr[:20]}... (Score: {receiver_score}, {receiver_entity})")
+                lines.append(f"      To: {receiver_addr[:20]}... (Score: {receiver_score}, {receiver_entity})")
     
     # Highlight malicious contracts
-    print(f"\n⚠️  CONTRACT ANALYSIS:")
-    malicious_found = False
-    
-    if 'inputs' in data and data['inputs']:
-        for inp in data['inputs']:
-            if inp.get('contract'):
-                addr = inp.get('address', 'N/A')
-                score = inp.get('score', 'N/A')
-                entity = inp.get('name', 'Unidentified')
-                if score and score < 4:
-                    print(f"   ⚠️  SUSPICIOUS CONTRACT (Input): {addr}")
-                    print(f"      Score: {score}/10 | Entity: {entity}")
-                    malicious_found = True
-    
-    if 'outputs' in data and data['outputs']:
-        for out in data['outputs']:
-            if out.get('contract'):
-                addr = out.get('address', 'N/A')
-                score = out.get('score', 'N/A')
-                entity = out.get('name', 'Unidentified')
-                if score and score < 4:
-                    print(f"   ⚠️  SUSPICIOUS CONTRACT (Output): {addr}")
-                    print(f"      Score: {score}/10 | Entity: {entity}")
-                    malicious_found = True
-    
-    if not malicious_found:
-        print("   ✅ No suspicious contracts detected")
+    lines.append(f"\n⚠️  CONTRACT ANALYSIS:")
+    for side, item in malicious:
+        lines.append(f"   ⚠️  SUSPICIOUS CONTRACT ({side}): {item.get('address', 'N/A')}")
+        lines.append(f"      Score: {item['score']}/10 | Entity: {item.get('name', 'Unidentified')}")
     
-    print("\n" + "="*80)
+    if not malicious:
+        lines.append("   ✅ No suspicious contracts detected")
+    
+    lines.append("\n" + "="*80)
+    _emit(lines)
 
 def print_transaction_summary(tx: Dict):
     """Print a brief summary of a transaction"""
-    print(f"Hash: {tx.get('hash', 'N/A')[:20]}...")
-    print(f"Time: {format_timestamp(tx.get('time', 0))}")
-    print(f"Direction: {tx.get('direction', 'N/A')}")
-    print(f"Amount: {tx.get('total_out' if tx.get('direction') == 'out' else 'total_in', 0):,}")
-    print(f"Amount USD: ${tx.get('total_out_usd' if tx.get('direction') == 'out' else 'total_in_usd', 0):,.2f}")
-    print(f"Fee: {tx.get('fee', 0):,} (${tx.get('fee_usd', 0):,.2f})")
-    print(f"Confirmations: {tx.get('confirmations', 0):,}")
+    lines = []
+    lines.append(f"Hash: {tx.get('hash', 'N/A')[:20]}...")
+    lines.append(f"Time: {format_timestamp(tx.get('time', 0))}")
+    lines.append(f"Direction: {tx.get('direction', 'N/A')}")
+    lines.append(f"Amount: {tx.get('total_out' if tx.get('direction') == 'out' else 'total_in', 0):,}")
+    lines.append(f"Amount USD: ${tx.get('total_out_usd' if tx.get('direction') == 'out' else 'total_in_usd', 0):,.2f}")
+    lines.append(f"Fee: {tx.get('fee', 0):,} (${tx.get('fee_usd', 0):,.2f})")
+    lines.append(f"Confirmations: {tx.get('confirmations', 0):,}")
+    _emit(lines)
 
 def print_address_stats(data: Dict):
     """Print address statistics"""
-    print("="*80)
-    print("📊 ADDRESS STATISTICS")
-    print("="*80)
+    lines = ["="*80, "📊 ADDRESS STATISTICS", "="*80]
     
     address = data.get('address', 'N/A')
-    print(f"\n🔹 Address: {address}")
+    lines.append(f"\n🔹 Address: {address}")
     
     balance = data.get('balance', {})
-    print(f"\n💰 Balance:")
-    print(f"   Current: {balance.get('balance', 0):,.8f} {data.get('blockchain', '').upper()}")
-    print(f"   Total In: {balance.get('total_in', 0):,.8f}")
-    print(f"   Total Out: {balance.get('total_out', 0):,.8f}")
+    lines.append(f"\n💰 Balance:")
+    lines.append(f"   Current: {balance.get('balance', 0):,.8f} {data.get('blockchain', '').upper()}")
+    lines.append(f"   Total In: {balance.get('total_in', 0):,.8f}")
+    lines.append(f"   Total Out: {balance.get('total_out', 0):,.8f}")
     
     balance_usd = data.get('balance_usd', {})
-    print(f"\n💰 Balance USD:")
-    print(f"   Current: ${balance_usd.get('balance', 0):,.2f}")
-    print(f"   Total In: ${balance_usd.get('total_in', 0):,.2f}")
-    print(f"   Total Out: ${balance_usd.get('total_out', 0):,.2f}")
+    lines.append(f"\n💰 Balance USD:")
+    lines.append(f"   Current: ${balance_usd.get('balance', 0):,.2f}")
+    lines.append(f"   Total In: ${balance_usd.get('total_in', 0):,.2f}")
+    lines.append(f"   Total Out: ${balance_usd.get('total_out', 0):,.2f}")
     
     trx_count = data.get('trx_count', {})
-    print(f"\n📊 Transactions:")
-    print(f"   Incoming: {trx_count.get('in', 0):,}")
-    print(f"   Outgoing: {trx_count.get('out', 0):,}")
+    lines.append(f"\n📊 Transactions:")
+    lines.append(f"   Incoming: {trx_count.get('in', 0):,}")
+    lines.append(f"   Outgoing: {trx_count.get('out', 0):,}")
     
     entity = data.get('entity')
     if entity:
-        print(f"\n🏢 Entity:")
-        print(f"   Name: {entity.get('name', 'N/A')}")
-        print(f"   Category: {entity.get('category', 'N/A')}")
-    
-    print(f"\n🔹 Score: {data.get('score', 'N/A')}/10")
-    print(f"🔹 First Seen: {format_timestamp(data.get('first_seen', 0))}")
-    print(f"🔹 Last Seen: {format_timestamp(data.get('last_seen', 0))}")
+        lines.append(f"\n🏢 Entity:")
+        lines.append(f"   Name: {entity.get('name', 'N/A')}")
+        lines.append(f"   Category: {entity.get('category', 'N/A')}")
+    
+    lines.append(f"\n🔹 Score: {data.get('score', 'N/A')}/10")
+    lines.append(f"🔹 First Seen: {format_timestamp(data.get('first_seen', 0))}")
+    lines.append(f"🔹 Last Seen: {format_timestamp(data.get('last_seen', 0))}")
+    _emit(lines)
 
 def format_timestamp(timestamp: int) -> str:
     """Format a Unix timestamp into a readable format"""
     if not timestamp:
         return "N/A"
     try:
-        dt = datetime.fromtimestamp(timestamp)
-        return dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-    except:
+        return time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(timestamp))
+    except (OSError, ValueError, TypeError, OverflowError):
         return str(timestamp)
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Verify blockchain transactions using the Caudena API",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+# Program name and help layout, fixed so the rendered help does not depend on the terminal
+PROG = "check_transaction.py"
+HELP_WIDTH = 80
+
+_EPILOG = """\
 Examples:
   # Verify transaction by hash
   python check_transaction.py --hash 0000000000000000000000000000000000000000000000000000000000000000 --currency btc
@@ -394,17 +548,44 @@ Examples:
   # Verify address
   python check_transaction.py --address xxxxxx --currency btc
 
-For more information, visit: https://docs.caudena.com
-        """
+For more information, visit: https://docs.caudena.com"""
+
+# Pre-rendered `--help` output, checked against the parser by the test suite
+_STATIC_HELP = """\
+usage: check_transaction.py [-h] (--hash HASH | --address ADDRESS)
+                            [--currency CURRENCY] [--limit LIMIT] [--no-cache]
+
+Verify blockchain transactions using the Caudena API
+
+options:
+  -h, --help           show this help message and exit
+  --hash HASH          Transaction hash to verify
+  --address ADDRESS    Blockchain address to verify
+  --currency CURRENCY  Currency/blockchain (default: btc). Supported: btc, eth,
+                       ltc, doge, trx, bnb
+  --limit LIMIT        Number of recent transactions to show in address mode
+                       (1-100, default: 5)
+  --no-cache           Do not read or write the local transaction cache
+
+""" + _EPILOG
+
+def _build_parser():
+    """Build the command line parser"""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog=PROG,
+        description="Verify blockchain transactions using the Caudena API",
+        formatter_class=functools.partial(argparse.RawDescriptionHelpFormatter, width=HELP_WIDTH),
+        epilog=_EPILOG
     )
     
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--hash",
         type=str,
         help="Transaction hash to verify"
     )
-    
-    parser.add_argument(
+    target.add_argument(
         "--address",
         type=str,
         help="Blockchain address to verify"
@@ -414,27 +595,59 @@ For more information, visit: https://docs.caudena.com
         "--currency",
         type=str,
         default="btc",
-        choices=["btc", "eth", "ltc", "doge", "trx", "bnb"],
-        help="Currency/blockchain (default: btc). Supported: btc, eth, ltc, doge, trx, bnb"
+        help=f"Currency/blockchain (default: btc). Supported: {', '.join(CURRENCIES)}"
+    )
+    
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=5,
+        help=f"Number of recent transactions to show in address mode (1-{MAX_LIMIT}, default: 5)"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the local transaction cache"
+    )
+    
+    return parser
+
+def main():
+    # Fast path: serve the pre-rendered help without building the parser
+    if sys.argv[1:] in (["-h"], ["--help"]):
+        print(_STATIC_HELP)
+        sys.exit(0)
+    if len(sys.argv) == 1:
+        usage = _STATIC_HELP.split("\n\n", 1)[0]
+        sys.stderr.write(f"{usage}\n{PROG}: error: You must provide --hash or --address\n")
+        sys.exit(2)
+    
+    parser = _build_parser()
     args = parser.parse_args()
     
-    if not args.hash and not args.address:
-        parser.error("You must provide --hash or --address")
+    if args.currency not in SUPPORTED_CURRENCIES:
+        parser.error(f"argument --currency: invalid choice: '{args.currency}' "
+                     f"(choose from {', '.join(map(repr, CURRENCIES))})")
     
-    if args.hash and args.address:
-        parser.error("Provide only --hash OR --address, not both")
+    if not 1 <= args.limit <= MAX_LIMIT:
+        parser.error(f"--limit must be between 1 and {MAX_LIMIT}")
     
     print("🔐 Authenticating...")
     kid, secret = get_api_credentials()
-    token = generate_jwt_token(kid, secret)
-    print("✅ Token generated successfully\n")
+    token, from_cache = get_jwt_token(kid, secret)
+    print("✅ Using cached token\n" if from_cache else "✅ Token generated successfully\n")
+    
+    # Authenticate every subsequent request on the shared client
+    _CLIENT.headers["Authorization"] = f"Bearer {token}"
+    _CLIENT.event_hooks["response"].append(
+        functools.partial(_drop_cached_token_on_401, _token_cache_path(kid, secret))
+    )
     
     if args.hash:
-        check_transaction_by_hash(args.currency, args.hash, token)
+        check_transaction_by_hash(args.currency, args.hash, use_cache=not args.no_cache)
     elif args.address:
-        check_transaction_by_address(args.currency, args.address, token)
+        check_transaction_by_address(args.currency, args.address, args.limit)
 
 if __name__ == "__main__":
     main()
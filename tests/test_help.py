@@ -0,0 +1,13 @@
+import sys
+
+import pytest
+
+import check_transaction
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="argparse titles the options section differently before 3.10")
+@pytest.mark.parametrize("columns", ["40", "80", "200"])
+def test_static_help_matches_parser(monkeypatch, columns):
+    """The pre-rendered --help must match argparse regardless of terminal width"""
+    monkeypatch.setenv("COLUMNS", columns)
+    assert check_transaction._build_parser().format_help() == check_transaction._STATIC_HELP + "\n"